@@ -1,8 +1,39 @@
 import asyncio
 import json
+import jsonschema
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import Tool, TextContent, CallToolResult
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+# Text before and after the name for each greeting style
+_GREETING_PARTS = {
+    "formal": ("Good day, ", ". I hope this message finds you well."),
+    "casual": ("Hey ", "! How's it going?"),
+    "enthusiastic": ("Hello there, ", "! Great to meet you! 🎉")
+}
+
+# Input schema for the greet tool, compiled once into a reusable validator
+_GREET_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {
+            "type": "string",
+            "description": "The name of the person to greet"
+        },
+        "style": {
+            "type": "string",
+            "enum": ["formal", "casual", "enthusiastic"],
+            "description": "The style of greeting"
+        }
+    },
+    "required": ["name"]
+}
+_GREET_VALIDATOR = jsonschema.Draft7Validator(_GREET_SCHEMA)
 
 # Create a server instance
 server = Server("hello-world-server")
@@ -14,38 +45,28 @@ async def list_tools():
         Tool(
             name="greet",
             description="Generate a personalized greeting",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the person to greet"
-                    },
-                    "style": {
-                        "type": "string",
-                        "enum": ["formal", "casual", "enthusiastic"],
-                        "description": "The style of greeting"
-                    }
-                },
-                "required": ["name"]
-            }
+            inputSchema=_GREET_SCHEMA
         )
     ]
 
-@server.call_tool()
+# Arguments are checked against the precompiled validator below, so the
+# SDK's per-call schema validation is switched off
+@server.call_tool(validate_input=False)
 async def call_tool(name: str, arguments: dict):
     """Handle tool calls."""
     if name == "greet":
+        try:
+            _GREET_VALIDATOR.validate(arguments)
+        except jsonschema.ValidationError as e:
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"Input validation error: {e.message}")],
+                isError=True
+            )
         person_name = arguments.get("name", "World")
         style = arguments.get("style", "casual")
         
-        greetings = {
-            "formal": f"Good day, {person_name}. I hope this message finds you well.",
-            "casual": f"Hey {person_name}! How's it going?",
-            "enthusiastic": f"Hello there, {person_name}! Great to meet you! 🎉"
-        }
-        
-        greeting = greetings.get(style, greetings["casual"])
+        prefix, suffix = _GREETING_PARTS.get(style, _GREETING_PARTS["casual"])
+        greeting = "".join((prefix, person_name, suffix))
         
         return [TextContent(
             type="text",
@@ -61,5 +82,8 @@ async def main():
         await server.run(read_stream, write_stream, options)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
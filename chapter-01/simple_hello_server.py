@@ -6,9 +6,44 @@ A basic demonstration of MCP server concepts without external dependencies.
 
 import asyncio
 import json
+import logging
+import operator
 from typing import Dict, Any, List
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+# Greeting templates by language; only the selected one is formatted per call
+_GREETING_TEMPLATES = {
+    "en": "Hello, {name}! Welcome to the MCP world!",
+    "es": "¡Hola, {name}! ¡Bienvenido al mundo MCP!",
+    "fr": "Bonjour, {name}! Bienvenue dans le monde MCP!"
+}
+
+# Arithmetic operations supported by the calculate tool
+_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv
+}
+
+def _dumps(payload: Any) -> bytes:
+    """Encode a payload as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
 class SimpleMCPServer:
     """
     A simple MCP server implementation for demonstration purposes.
@@ -50,60 +85,82 @@ class SimpleMCPServer:
                 "type": "application/json"
             }
         }
+        
+        # Static resource content is built once and shared by every request
+        self._server_info = {
+            "name": self.name,
+            "version": self.version,
+            "description": "A simple MCP hello world server",
+            "capabilities": list(self.tools.keys()),
+            "resources": list(self.resources.keys())
+        }
+        self._sample_data = {
+            "users": [
+                {"id": 1, "name": "Alice", "role": "developer"},
+                {"id": 2, "name": "Bob", "role": "designer"},
+                {"id": 3, "name": "Charlie", "role": "manager"}
+            ],
+            "projects": [
+                {"id": 1, "name": "MCP Demo", "status": "active"},
+                {"id": 2, "name": "AI Assistant", "status": "planning"}
+            ]
+        }
+        self._encoded_resources = {
+            "sample_data": _dumps(self._sample_data)
+        }
+        
+        # Dispatch tables for tool and resource requests
+        self._tool_handlers = {
+            "greet": self._greet_tool,
+            "get_time": self._get_time_tool,
+            "calculate": self._calculate_tool
+        }
+        self._resource_handlers = {
+            "server_info": self._server_info_resource,
+            "sample_data": self._sample_data_resource
+        }
     
     async def handle_tool_call(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tool execution requests."""
-        print(f"🔧 Executing tool: {tool_name} with parameters: {parameters}")
+        logger.debug("🔧 Executing tool: %s with parameters: %s", tool_name, parameters)
         
-        if tool_name == "greet":
-            return await self._greet_tool(parameters)
-        elif tool_name == "get_time":
-            return await self._get_time_tool()
-        elif tool_name == "calculate":
-            return await self._calculate_tool(parameters)
-        else:
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
             return {"error": f"Unknown tool: {tool_name}"}
+        return await handler(parameters)
     
     async def handle_resource_request(self, resource_name: str) -> Dict[str, Any]:
         """Handle resource access requests."""
-        print(f"📁 Accessing resource: {resource_name}")
+        logger.debug("📁 Accessing resource: %s", resource_name)
         
-        if resource_name == "server_info":
-            return {
-                "name": self.name,
-                "version": self.version,
-                "description": "A simple MCP hello world server",
-                "capabilities": list(self.tools.keys()),
-                "resources": list(self.resources.keys()),
-                "timestamp": datetime.now().isoformat()
-            }
-        elif resource_name == "sample_data":
-            return {
-                "users": [
-                    {"id": 1, "name": "Alice", "role": "developer"},
-                    {"id": 2, "name": "Bob", "role": "designer"},
-                    {"id": 3, "name": "Charlie", "role": "manager"}
-                ],
-                "projects": [
-                    {"id": 1, "name": "MCP Demo", "status": "active"},
-                    {"id": 2, "name": "AI Assistant", "status": "planning"}
-                ]
-            }
-        else:
+        handler = self._resource_handlers.get(resource_name)
+        if handler is None:
             return {"error": f"Unknown resource: {resource_name}"}
+        return await handler()
+    
+    async def handle_resource_request_json(self, resource_name: str) -> bytes:
+        """Handle resource access requests, returning the JSON-encoded payload."""
+        encoded = self._encoded_resources.get(resource_name)
+        if encoded is not None:
+            logger.debug("📁 Accessing resource: %s", resource_name)
+            return encoded
+        return _dumps(await self.handle_resource_request(resource_name))
+    
+    async def _server_info_resource(self) -> Dict[str, Any]:
+        """Describe this server."""
+        return {**self._server_info, "timestamp": datetime.now().isoformat()}
+    
+    async def _sample_data_resource(self) -> Dict[str, Any]:
+        """Return sample users and projects."""
+        return self._sample_data
     
     async def _greet_tool(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Greet a user in the specified language."""
         name = parameters.get("name", "World")
         language = parameters.get("language", "en")
         
-        greetings = {
-            "en": f"Hello, {name}! Welcome to the MCP world!",
-            "es": f"¡Hola, {name}! ¡Bienvenido al mundo MCP!",
-            "fr": f"Bonjour, {name}! Bienvenue dans le monde MCP!"
-        }
-        
-        greeting = greetings.get(language, greetings["en"])
+        template = _GREETING_TEMPLATES.get(language, _GREETING_TEMPLATES["en"])
+        greeting = template.format(name=name)
         
         return {
             "greeting": greeting,
@@ -111,7 +168,7 @@ class SimpleMCPServer:
             "timestamp": datetime.now().isoformat()
         }
     
-    async def _get_time_tool(self) -> Dict[str, Any]:
+    async def _get_time_tool(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get the current time."""
         now = datetime.now()
         return {
@@ -127,22 +184,17 @@ class SimpleMCPServer:
         a = parameters.get("a")
         b = parameters.get("b")
         
-        if not all([operation, a is not None, b is not None]):
+        if not operation or a is None or b is None:
             return {"error": "Missing required parameters: operation, a, b"}
         
+        operation_func = _OPERATIONS.get(operation)
+        if operation_func is None:
+            return {"error": f"Unknown operation: {operation}"}
+        if operation == "divide" and b == 0:
+            return {"error": "Division by zero"}
+        
         try:
-            if operation == "add":
-                result = a + b
-            elif operation == "subtract":
-                result = a - b
-            elif operation == "multiply":
-                result = a * b
-            elif operation == "divide":
-                if b == 0:
-                    return {"error": "Division by zero"}
-                result = a / b
-            else:
-                return {"error": f"Unknown operation: {operation}"}
+            result = operation_func(a, b)
             
             return {
                 "operation": operation,
@@ -231,5 +283,9 @@ async def demonstrate_mcp_server():
     print("\n✅ Simple MCP Server Demo Complete!")
 
 if __name__ == "__main__":
-    asyncio.run(demonstrate_mcp_server())
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if uvloop is not None:
+        uvloop.run(demonstrate_mcp_server())
+    else:
+        asyncio.run(demonstrate_mcp_server())
 
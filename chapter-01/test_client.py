@@ -4,9 +4,18 @@ import sys
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 async def test_hello_server():
     """Test our hello world server."""
     
+    # Run client coroutines eagerly until their first real suspension
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Create server parameters
     server_params = StdioServerParameters(
         command=sys.executable,
@@ -40,5 +49,8 @@ async def test_hello_server():
                     print(f"Response: {content.text}")
 
 if __name__ == "__main__":
-    asyncio.run(test_hello_server())
+    if uvloop is not None:
+        uvloop.run(test_hello_server())
+    else:
+        asyncio.run(test_hello_server())
 
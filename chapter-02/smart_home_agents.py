@@ -1,82 +1,146 @@
 import asyncio
 import json
+import logging
 import random
+import time
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
-from enum import Enum
+from typing import Dict, Optional, Any
+from enum import StrEnum
 
-class MessageType(Enum):
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on pending messages per agent; senders wait when it is reached
+MESSAGE_QUEUE_SIZE = 1024
+
+# Recipient recorded on messages sent to every registered agent
+BROADCAST_RECIPIENT = "*"
+
+class MessageType(StrEnum):
     STATUS_UPDATE = "status_update"
     REQUEST = "request"
     RESPONSE = "response"
     ALERT = "alert"
     COORDINATION = "coordination"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     sender: str
     recipient: str
     message_type: MessageType
     content: Dict[str, Any]
     timestamp: datetime
-    message_id: str
+    message_id: int  # Unique per sender
 
 class SmartHomeAgent:
     """Base class for smart home agents."""
     
+    __slots__ = ("name", "agent_type", "message_queue", "other_agents", "status",
+                 "running", "_stop_event", "_msg_seq")
+    
     def __init__(self, name: str, agent_type: str):
         self.name = name
         self.agent_type = agent_type
-        self.message_queue: List[Message] = []
+        self.message_queue: asyncio.Queue[Optional[Message]] = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
         self.other_agents: Dict[str, 'SmartHomeAgent'] = {}
         self.status: Dict[str, Any] = {}
         self.running = False
+        self._stop_event = asyncio.Event()
+        self._msg_seq = 0
     
     def register_agent(self, agent: 'SmartHomeAgent'):
         """Register another agent for communication."""
         self.other_agents[agent.name] = agent
     
-    async def send_message(self, recipient: str, message_type: MessageType, content: Dict[str, Any]):
-        """Send a message to another agent."""
-        if recipient not in self.other_agents:
-            print(f"❌ {self.name}: Unknown recipient {recipient}")
-            return
-        
-        message = Message(
+    def _new_message(self, recipient: str, message_type: MessageType, content: Dict[str, Any]) -> Message:
+        """Create the next message sent by this agent."""
+        self._msg_seq += 1
+        return Message(
             sender=self.name,
             recipient=recipient,
             message_type=message_type,
             content=content,
             timestamp=datetime.now(),
-            message_id=f"{self.name}_{datetime.now().timestamp()}"
+            message_id=self._msg_seq
         )
+    
+    async def send_message(self, recipient: str, message_type: MessageType, content: Dict[str, Any]):
+        """Send a message to another agent."""
+        agent = self.other_agents.get(recipient)
+        if agent is None:
+            logger.warning("❌ %s: Unknown recipient %s", self.name, recipient)
+            return
         
-        self.other_agents[recipient].message_queue.append(message)
-        print(f"📨 {self.name} → {recipient}: {message_type.value}")
+        await self._deliver(agent, self._new_message(recipient, message_type, content))
+        logger.debug("📨 %s → %s: %s", self.name, recipient, message_type)
     
     async def broadcast_message(self, message_type: MessageType, content: Dict[str, Any]):
         """Broadcast a message to all other agents."""
-        for agent_name in self.other_agents:
-            await self.send_message(agent_name, message_type, content)
+        # Messages are immutable, so every recipient can share one instance
+        message = self._new_message(BROADCAST_RECIPIENT, message_type, content)
+        logger.debug("📨 %s → %s: %s", self.name, BROADCAST_RECIPIENT, message_type)
+        await asyncio.gather(*(
+            self._deliver(agent, message)
+            for agent in self.other_agents.values()
+        ))
+    
+    async def _deliver(self, agent: "SmartHomeAgent", message: Message):
+        """Queue a message for an agent, giving up if this agent stops while that queue is full."""
+        queue = agent.message_queue
+        if not queue.full():
+            queue.put_nowait(message)
+            return
+        
+        delivered = False
+        if not self._stop_event.is_set():
+            put = asyncio.ensure_future(queue.put(message))
+            stopped = asyncio.ensure_future(self._stop_event.wait())
+            try:
+                await asyncio.wait((put, stopped), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                stopped.cancel()
+                delivered = put.done()
+                put.cancel()
+        if not delivered:
+            logger.debug("🗑️ %s: Dropped message for %s while stopping", self.name, agent.name)
     
     async def process_messages(self):
-        """Process incoming messages."""
-        while self.message_queue:
-            message = self.message_queue.pop(0)
+        """Process incoming messages as they arrive."""
+        while self.running:
+            message = await self.message_queue.get()
+            if message is None:  # Wake-up sentinel from stop()
+                continue
             await self.handle_message(message)
     
     async def handle_message(self, message: Message):
         """Handle a specific message (to be overridden by subclasses)."""
-        print(f"📬 {self.name}: Received {message.message_type.value} from {message.sender}")
+        logger.debug("📬 %s: Received %s from %s", self.name, message.message_type, message.sender)
     
     async def run(self):
         """Main agent loop."""
         self.running = True
-        while self.running:
+        self._stop_event.clear()
+        status_task = asyncio.create_task(self._run_status_updates())
+        try:
             await self.process_messages()
+        finally:
+            self.running = False
+            self._stop_event.set()
+            await status_task
+    
+    async def _run_status_updates(self):
+        """Update agent status once a second until the agent stops."""
+        while self.running:
             await self.update_status()
-            await asyncio.sleep(1)
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
     
     async def update_status(self):
         """Update agent status (to be overridden by subclasses)."""
@@ -85,10 +149,18 @@ class SmartHomeAgent:
     def stop(self):
         """Stop the agent."""
         self.running = False
+        self._stop_event.set()
+        try:
+            self.message_queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # The message loop is busy and will see running=False
 
 class ThermostatAgent(SmartHomeAgent):
     """Agent that manages home temperature."""
     
+    __slots__ = ("current_temp", "target_temp", "heating", "cooling",
+                 "energy_efficiency_mode", "_rng")
+    
     def __init__(self):
         super().__init__("Thermostat", "climate_control")
         self.current_temp = 72.0
@@ -96,17 +168,19 @@ class ThermostatAgent(SmartHomeAgent):
         self.heating = False
         self.cooling = False
         self.energy_efficiency_mode = False
+        self._rng = random.Random()
     
     async def update_status(self):
         """Update thermostat status."""
         # Simulate temperature changes
+        rand = self._rng.random
         if self.heating:
-            self.current_temp += random.uniform(0.1, 0.3)
+            self.current_temp += rand() * 0.2 + 0.1
         elif self.cooling:
-            self.current_temp -= random.uniform(0.1, 0.3)
+            self.current_temp -= rand() * 0.2 + 0.1
         else:
             # Natural temperature drift
-            self.current_temp += random.uniform(-0.1, 0.1)
+            self.current_temp += rand() * 0.2 - 0.1
         
         # Control logic
         temp_diff = self.target_temp - self.current_temp
@@ -172,27 +246,42 @@ class ThermostatAgent(SmartHomeAgent):
 class EnergyAgent(SmartHomeAgent):
     """Agent that manages energy consumption."""
     
+    __slots__ = ("total_consumption", "peak_hours", "energy_saving_mode",
+                 "appliance_usage", "_thermostat", "_peak_cache_until")
+    
     def __init__(self):
         super().__init__("Energy", "energy_management")
         self.total_consumption = 0.0
         self.peak_hours = False
         self.energy_saving_mode = False
         self.appliance_usage: Dict[str, float] = {}
+        self._thermostat: Optional[ThermostatAgent] = None
+        self._peak_cache_until = 0.0
+    
+    def register_agent(self, agent: SmartHomeAgent):
+        """Register another agent, keeping a direct reference to the thermostat."""
+        super().register_agent(agent)
+        if agent.name == "Thermostat":
+            self._thermostat = agent
     
     async def update_status(self):
         """Update energy status."""
-        current_hour = datetime.now().hour
-        self.peak_hours = 16 <= current_hour <= 20  # 4 PM to 8 PM
+        # Peak hours only change twice a day, so re-check once a minute
+        now = time.time()
+        if now >= self._peak_cache_until:
+            current_hour = datetime.fromtimestamp(now).hour
+            self.peak_hours = 16 <= current_hour <= 20  # 4 PM to 8 PM
+            self._peak_cache_until = now + 60
         
         # Calculate energy consumption based on other agents' status
         consumption = 5.0  # Base consumption
         
         # Check thermostat status
-        thermostat = self.other_agents.get("Thermostat")
-        if thermostat:
-            if thermostat.status.get("heating"):
+        if self._thermostat is not None:
+            thermostat_status = self._thermostat.status
+            if thermostat_status.get("heating"):
                 consumption += 15.0
-            elif thermostat.status.get("cooling"):
+            elif thermostat_status.get("cooling"):
                 consumption += 12.0
         
         self.total_consumption += consumption / 60  # Per minute
@@ -218,6 +307,10 @@ class EnergyAgent(SmartHomeAgent):
 async def demo_smart_home_system():
     """Demonstrate the smart home multi-agent system."""
     
+    # Run agent coroutines eagerly until their first real suspension
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Create agents
     thermostat = ThermostatAgent()
     energy = EnergyAgent()
@@ -257,5 +350,9 @@ async def demo_smart_home_system():
             agent.stop()
 
 if __name__ == "__main__":
-    asyncio.run(demo_smart_home_system())
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if uvloop is not None:
+        uvloop.run(demo_smart_home_system())
+    else:
+        asyncio.run(demo_smart_home_system())
 
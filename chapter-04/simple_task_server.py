@@ -5,38 +5,208 @@ Demonstrates the core MCP interfaces with working code.
 """
 
 import asyncio
+import itertools
 import json
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
-from enum import Enum
+from typing import Dict, List, Any, Optional
+
+try:
+    import msgspec
+except ImportError:  # Optional; tasks fall back to slots dataclasses and the json module
+    msgspec = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 # Import MCP components
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, Resource, Prompt, TextContent
+from mcp.types import Tool, Resource, Prompt, TextContent, GetPromptResult, PromptMessage
+
+if msgspec is not None:
+    # Shared JSON encoder for tool and resource responses; it serializes
+    # Task structs directly
+    _ENC = msgspec.json.Encoder()
+    
+    def _dump(obj: Any) -> str:
+        """Encode a response payload as compact JSON text."""
+        return _ENC.encode(obj).decode()
+else:
+    def _task_fields(obj: Any) -> Dict[str, Any]:
+        """Turn a Task into a dict of its fields for the json module."""
+        if isinstance(obj, Task):
+            return {name: getattr(obj, name) for name in Task.__slots__}
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _dump(obj: Any) -> str:
+        """Encode a response payload as compact JSON text."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_task_fields)
+
+# Task status values
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+_VALID_STATUSES = frozenset({PENDING, IN_PROGRESS, COMPLETED})
+
+# How long a cached creation timestamp is reused, in seconds
+_TIMESTAMP_TTL = 0.25
+
+# Upper bound on stored tasks; the oldest completed task is evicted first
+MAX_TASKS = 10_000
+
+if msgspec is not None:
+    class Task(msgspec.Struct, gc=False):
+        id: str
+        title: str
+        description: str
+        status: str
+        created_at: str
+        assigned_to: Optional[str] = None
+else:
+    @dataclass(slots=True)
+    class Task:
+        id: str
+        title: str
+        description: str
+        status: str
+        created_at: str
+        assigned_to: Optional[str] = None
 
-class TaskStatus(Enum):
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
+# Input schemas for the task tools
+_CREATE_TASK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "assigned_to": {"type": "string"}
+    },
+    "required": ["title", "description"]
+}
 
-@dataclass
-class Task:
-    id: str
-    title: str
-    description: str
-    status: TaskStatus
-    created_at: str
-    assigned_to: str = None
+_LIST_TASKS_SCHEMA = {"type": "object", "properties": {}}
+
+_UPDATE_STATUS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_id": {"type": "string"},
+        "status": {"type": "string", "enum": [PENDING, IN_PROGRESS, COMPLETED]}
+    },
+    "required": ["task_id", "status"]
+}
+
+# MCP capability descriptors; they never change, so they are built once
+_TOOLS = [
+    Tool(
+        name="create_task",
+        description="Create a new task",
+        inputSchema=_CREATE_TASK_SCHEMA
+    ),
+    Tool(
+        name="list_tasks",
+        description="List all tasks",
+        inputSchema=_LIST_TASKS_SCHEMA
+    ),
+    Tool(
+        name="update_status",
+        description="Update task status",
+        inputSchema=_UPDATE_STATUS_SCHEMA
+    )
+]
+
+_RESOURCES = [
+    Resource(
+        uri="tasks://all",
+        name="All Tasks",
+        description="Complete list of all tasks",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri="tasks://summary",
+        name="Task Summary",
+        description="Summary statistics about tasks",
+        mimeType="application/json"
+    )
+]
+
+_PROMPTS = [
+    Prompt(
+        name="task_report",
+        description="Generate a task status report",
+        arguments=[]
+    ),
+    Prompt(
+        name="task_summary",
+        description="Summarize a specific task",
+        arguments=[
+            {"name": "task_id", "description": "ID of the task", "required": True}
+        ]
+    )
+]
+
+# Body of the task_report prompt
+_REPORT_TEMPLATE = """Generate a comprehensive task status report based on the following data:
+
+Total Tasks: {total}
+Completed Tasks: {completed}
+Completion Rate: {rate}
+
+Recent Tasks:
+{recent}
+Please provide insights and recommendations based on this data."""
+
+# Body of the task_summary prompt
+_SUMMARY_TEMPLATE = """Provide a detailed summary of the following task:
+
+Title: {title}
+Description: {description}
+Status: {status}
+Assigned to: {assigned}
+Created: {created}
+
+Please analyze the task status and provide recommendations for next steps."""
 
 class SimpleTaskServer:
     """A simple MCP server demonstrating all major interfaces."""
     
     def __init__(self):
         self.server = Server("simple-task-manager")
-        self.tasks: Dict[str, Task] = {}
-        self.next_id = 1
+        self.tasks: OrderedDict[str, Task] = OrderedDict()
+        self._id_counter = itertools.count(1)
+        
+        # Number of tasks in each status, kept in step with self.tasks
+        self._status_counts: Dict[str, int] = {status: 0 for status in _VALID_STATUSES}
+        # Ids of completed tasks in the order they were completed, a dict used as an
+        # insertion-ordered set so the eviction candidate is always its first key
+        self._completed_ids: Dict[str, None] = {}
+        
+        # Encoded list_tasks and resource payloads, rebuilt on the first read after a change
+        self._all_cache: Optional[str] = None
+        self._list_cache: Optional[str] = None
+        self._summary_cache: Optional[str] = None
+        
+        # Last creation timestamp and the loop time it was taken at
+        self._ts_cache = ("", float("-inf"))
+        
+        # Handlers for each tool name, resource URI and prompt name
+        self._tool_handlers = {
+            "create_task": self._tool_create,
+            "list_tasks": self._tool_list,
+            "update_status": self._tool_update
+        }
+        self._resource_handlers = {
+            "tasks://all": self._resource_all,
+            "tasks://summary": self._resource_summary
+        }
+        self._prompt_handlers = {
+            "task_report": self._prompt_task_report,
+            "task_summary": self._prompt_task_summary
+        }
         
         # Create some sample tasks
         self._create_sample_tasks()
@@ -50,228 +220,221 @@ class SimpleTaskServer:
         """Create sample tasks for demonstration."""
         tasks = [
             Task("1", "Setup project", "Initialize the project structure", 
-                 TaskStatus.COMPLETED, datetime.now().isoformat(), "alice"),
+                 COMPLETED, datetime.now().isoformat(), "alice"),
             Task("2", "Write documentation", "Create user documentation", 
-                 TaskStatus.IN_PROGRESS, datetime.now().isoformat(), "bob"),
+                 IN_PROGRESS, datetime.now().isoformat(), "bob"),
             Task("3", "Add tests", "Write unit tests", 
-                 TaskStatus.PENDING, datetime.now().isoformat())
+                 PENDING, datetime.now().isoformat())
         ]
         
         for task in tasks:
-            self.tasks[task.id] = task
+            self._add_task(task)
         
-        self.next_id = 4
+        self._id_counter = itertools.count(4)
+    
+    def _add_task(self, task: Task):
+        """Store a task and count it under its status."""
+        self.tasks[task.id] = task
+        self._status_counts[task.status] += 1
+        if task.status == COMPLETED:
+            self._completed_ids[task.id] = None
+        if len(self.tasks) > MAX_TASKS:
+            self._evict_task()
+        self._invalidate_caches()
+    
+    def _evict_task(self):
+        """Drop the earliest completed task, or the oldest task if none are completed."""
+        if self._completed_ids:
+            evict_id = next(iter(self._completed_ids))
+            del self._completed_ids[evict_id]
+            task = self.tasks.pop(evict_id)
+        else:
+            _, task = self.tasks.popitem(last=False)
+        self._status_counts[task.status] -= 1
+    
+    def _now_iso(self, loop: asyncio.AbstractEventLoop) -> str:
+        """Return the current time in ISO format, refreshed every _TIMESTAMP_TTL seconds."""
+        now = loop.time()
+        if now - self._ts_cache[1] > _TIMESTAMP_TTL:
+            self._ts_cache = (datetime.now().isoformat(), now)
+        return self._ts_cache[0]
+    
+    def _invalidate_caches(self):
+        """Drop cached payloads after the task set changes."""
+        self._all_cache = None
+        self._list_cache = None
+        self._summary_cache = None
     
     def _register_tools(self):
         """Register tool providers."""
         
         @self.server.list_tools()
         async def list_tools():
-            return [
-                Tool(
-                    name="create_task",
-                    description="Create a new task",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "title": {"type": "string"},
-                            "description": {"type": "string"},
-                            "assigned_to": {"type": "string"}
-                        },
-                        "required": ["title", "description"]
-                    }
-                ),
-                Tool(
-                    name="list_tasks",
-                    description="List all tasks",
-                    inputSchema={"type": "object", "properties": {}}
-                ),
-                Tool(
-                    name="update_status",
-                    description="Update task status",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "task_id": {"type": "string"},
-                            "status": {"type": "string", "enum": ["pending", "in_progress", "completed"]}
-                        },
-                        "required": ["task_id", "status"]
-                    }
-                )
-            ]
+            return _TOOLS
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict):
-            if name == "create_task":
-                task_id = str(self.next_id)
-                self.next_id += 1
-                
-                task = Task(
-                    id=task_id,
-                    title=arguments["title"],
-                    description=arguments["description"],
-                    status=TaskStatus.PENDING,
-                    created_at=datetime.now().isoformat(),
-                    assigned_to=arguments.get("assigned_to")
-                )
-                
-                self.tasks[task_id] = task
-                
-                result = {
-                    "success": True,
-                    "task_id": task_id,
-                    "message": f"Task '{task.title}' created"
-                }
-                
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-            
-            elif name == "list_tasks":
-                tasks_list = []
-                for task in self.tasks.values():
-                    task_dict = asdict(task)
-                    task_dict['status'] = task.status.value
-                    tasks_list.append(task_dict)
-                
-                result = {
-                    "tasks": tasks_list,
-                    "total": len(tasks_list)
-                }
-                
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-            
-            elif name == "update_status":
-                task_id = arguments["task_id"]
-                new_status = TaskStatus(arguments["status"])
-                
-                if task_id not in self.tasks:
-                    raise ValueError(f"Task {task_id} not found")
-                
-                old_status = self.tasks[task_id].status
-                self.tasks[task_id].status = new_status
-                
-                result = {
-                    "success": True,
-                    "task_id": task_id,
-                    "old_status": old_status.value,
-                    "new_status": new_status.value
-                }
-                
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-            
-            else:
+            handler = self._tool_handlers.get(name)
+            if handler is None:
                 raise ValueError(f"Unknown tool: {name}")
+            return await handler(arguments)
+    
+    async def _tool_create(self, arguments: dict):
+        """Create a new task."""
+        task_id = str(next(self._id_counter))
+        
+        task = Task(
+            id=task_id,
+            title=arguments["title"],
+            description=arguments["description"],
+            status=PENDING,
+            created_at=self._now_iso(asyncio.get_running_loop()),
+            assigned_to=arguments.get("assigned_to")
+        )
+        
+        self._add_task(task)
+        
+        result = {
+            "success": True,
+            "task_id": task_id,
+            "message": f"Task '{task.title}' created"
+        }
+        
+        return [TextContent(type="text", text=_dump(result))]
+    
+    async def _tool_list(self, arguments: dict):
+        """List all tasks."""
+        if self._list_cache is None:
+            result = {
+                "tasks": list(self.tasks.values()),
+                "total": len(self.tasks)
+            }
+            self._list_cache = _dump(result)
+        
+        return [TextContent(type="text", text=self._list_cache)]
+    
+    async def _tool_update(self, arguments: dict):
+        """Update the status of a task."""
+        task_id = arguments["task_id"]
+        new_status = arguments["status"]
+        if new_status not in _VALID_STATUSES:
+            raise ValueError(f"Invalid status: {new_status}")
+        
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"Task {task_id} not found")
+        
+        old_status = task.status
+        task.status = new_status
+        self._status_counts[old_status] -= 1
+        self._status_counts[new_status] += 1
+        if new_status == COMPLETED:
+            self._completed_ids[task_id] = None
+        elif old_status == COMPLETED:
+            del self._completed_ids[task_id]
+        self._invalidate_caches()
+        
+        result = {
+            "success": True,
+            "task_id": task_id,
+            "old_status": old_status,
+            "new_status": new_status
+        }
+        
+        return [TextContent(type="text", text=_dump(result))]
     
     def _register_resources(self):
         """Register resource providers."""
         
         @self.server.list_resources()
         async def list_resources():
-            return [
-                Resource(
-                    uri="tasks://all",
-                    name="All Tasks",
-                    description="Complete list of all tasks",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri="tasks://summary",
-                    name="Task Summary",
-                    description="Summary statistics about tasks",
-                    mimeType="application/json"
-                )
-            ]
+            return _RESOURCES
         
         @self.server.read_resource()
         async def read_resource(uri: str):
-            if uri == "tasks://all":
-                tasks_data = {}
-                for task_id, task in self.tasks.items():
-                    task_dict = asdict(task)
-                    task_dict['status'] = task.status.value
-                    tasks_data[task_id] = task_dict
-                
-                return [TextContent(type="text", text=json.dumps(tasks_data, indent=2))]
-            
-            elif uri == "tasks://summary":
-                total = len(self.tasks)
-                completed = len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED])
-                in_progress = len([t for t in self.tasks.values() if t.status == TaskStatus.IN_PROGRESS])
-                pending = len([t for t in self.tasks.values() if t.status == TaskStatus.PENDING])
-                
-                summary = {
-                    "total_tasks": total,
-                    "completed": completed,
-                    "in_progress": in_progress,
-                    "pending": pending,
-                    "completion_rate": f"{completed/total*100:.1f}%" if total > 0 else "0%"
-                }
-                
-                return [TextContent(type="text", text=json.dumps(summary, indent=2))]
-            
-            else:
+            # The MCP server passes the URI as a pydantic AnyUrl
+            handler = self._resource_handlers.get(str(uri))
+            if handler is None:
                 raise ValueError(f"Unknown resource: {uri}")
+            return await handler()
+    
+    async def _resource_all(self):
+        """Read every task."""
+        if self._all_cache is None:
+            self._all_cache = _dump(self.tasks)
+        return [ReadResourceContents(content=self._all_cache, mime_type="application/json")]
+    
+    async def _resource_summary(self):
+        """Read summary statistics about the tasks."""
+        if self._summary_cache is None:
+            total = len(self.tasks)
+            completed = self._status_counts[COMPLETED]
+            in_progress = self._status_counts[IN_PROGRESS]
+            pending = self._status_counts[PENDING]
+            
+            summary = {
+                "total_tasks": total,
+                "completed": completed,
+                "in_progress": in_progress,
+                "pending": pending,
+                "completion_rate": f"{completed/total*100:.1f}%" if total > 0 else "0%"
+            }
+            self._summary_cache = _dump(summary)
+        
+        return [ReadResourceContents(content=self._summary_cache, mime_type="application/json")]
     
     def _register_prompts(self):
         """Register prompt providers."""
         
         @self.server.list_prompts()
         async def list_prompts():
-            return [
-                Prompt(
-                    name="task_report",
-                    description="Generate a task status report",
-                    arguments=[]
-                ),
-                Prompt(
-                    name="task_summary",
-                    description="Summarize a specific task",
-                    arguments=[
-                        {"name": "task_id", "description": "ID of the task", "required": True}
-                    ]
-                )
-            ]
+            return _PROMPTS
         
         @self.server.get_prompt()
-        async def get_prompt(name: str, arguments: dict):
-            if name == "task_report":
-                total = len(self.tasks)
-                completed = len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED])
-                
-                prompt = f"""Generate a comprehensive task status report based on the following data:
-
-Total Tasks: {total}
-Completed Tasks: {completed}
-Completion Rate: {completed/total*100:.1f}% if total > 0 else 0%
-
-Recent Tasks:
-"""
-                for task in list(self.tasks.values())[-3:]:
-                    prompt += f"- {task.title} ({task.status.value})\n"
-                
-                prompt += "\nPlease provide insights and recommendations based on this data."
-                
-                return [TextContent(type="text", text=prompt)]
-            
-            elif name == "task_summary":
-                task_id = arguments.get("task_id")
-                if not task_id or task_id not in self.tasks:
-                    raise ValueError(f"Task {task_id} not found")
-                
-                task = self.tasks[task_id]
-                prompt = f"""Provide a detailed summary of the following task:
-
-Title: {task.title}
-Description: {task.description}
-Status: {task.status.value}
-Assigned to: {task.assigned_to or 'Unassigned'}
-Created: {task.created_at}
-
-Please analyze the task status and provide recommendations for next steps."""
-                
-                return [TextContent(type="text", text=prompt)]
-            
-            else:
+        async def get_prompt(name: str, arguments: Optional[Dict[str, str]]):
+            handler = self._prompt_handlers.get(name)
+            if handler is None:
                 raise ValueError(f"Unknown prompt: {name}")
+            # Clients may leave out arguments entirely
+            prompt = await handler(arguments or {})
+            return GetPromptResult(
+                messages=[PromptMessage(role="user", content=TextContent(type="text", text=prompt))]
+            )
+    
+    async def _prompt_task_report(self, arguments: dict) -> str:
+        """Build the task status report prompt."""
+        total = len(self.tasks)
+        completed = self._status_counts[COMPLETED]
+        
+        # The three most recently created tasks, oldest first
+        recent = list(itertools.islice(reversed(self.tasks.values()), 3))
+        recent.reverse()
+        
+        prompt = _REPORT_TEMPLATE.format_map({
+            "total": total,
+            "completed": completed,
+            "rate": f"{completed/total*100:.1f}%" if total > 0 else "0%",
+            "recent": "".join(f"- {task.title} ({task.status})\n" for task in recent)
+        })
+        
+        return prompt
+    
+    async def _prompt_task_summary(self, arguments: dict) -> str:
+        """Build the summary prompt for a single task."""
+        task_id = arguments.get("task_id")
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"Task {task_id} not found")
+        
+        prompt = _SUMMARY_TEMPLATE.format(
+            title=task.title,
+            description=task.description,
+            status=task.status,
+            assigned=task.assigned_to or "Unassigned",
+            created=task.created_at
+        )
+        
+        return prompt
     
     async def run(self):
         """Run the MCP server."""
@@ -281,10 +444,17 @@ Please analyze the task status and provide recommendations for next steps."""
 
 async def main():
     """Main function to run the server."""
+    # Run request handlers eagerly until their first real suspension
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     server = SimpleTaskServer()
     print("🚀 Starting Simple Task Manager MCP Server...")
     await server.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
@@ -4,27 +4,51 @@ Test client for the Simple Task Manager MCP Server
 """
 
 import asyncio
-import json
 import sys
-import subprocess
-from mcp.client.stdio import stdio_client
+from contextlib import asynccontextmanager
+
+import anyio
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCMessage
+
+from simple_task_server import SimpleTaskServer
+
+@asynccontextmanager
+async def in_proc_client(server: SimpleTaskServer):
+    """Run the server in this process and connect to it through in-memory streams."""
+    # The streams carry SessionMessage objects as-is, so no frame is ever
+    # encoded to JSON (or any other wire format) on the way to the server
+    client_write, server_read = anyio.create_memory_object_stream(16)
+    server_write, client_read = anyio.create_memory_object_stream(16)
+    options = server.server.create_initialization_options()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(server.server.run, server_read, server_write, options)
+        try:
+            yield client_read, client_write
+        finally:
+            tg.cancel_scope.cancel()
+
+async def send(write, message: dict):
+    """Send a JSON-RPC message to the server."""
+    await write.send(SessionMessage(JSONRPCMessage.model_validate(message)))
+
+async def recv(read) -> dict:
+    """Receive the next JSON-RPC message from the server."""
+    response = await read.receive()
+    return response.message.model_dump(mode="json", exclude_none=True)
 
 async def test_simple_task_server():
     """Test the simple task manager server."""
-    
+
     print("🧪 Testing Simple Task Manager MCP Server...\n")
-    
-    # Start the server as a subprocess
-    server_process = subprocess.Popen([
-        sys.executable, "simple_task_server.py"
-    ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    
+
     try:
         # Connect to the server
-        async with stdio_client(server_process) as (read, write):
+        async with in_proc_client(SimpleTaskServer()) as (read, write):
             # Initialize the session
             print("🔌 Connecting to server...")
-            
+
             # Send initialization request
             init_request = {
                 "jsonrpc": "2.0",
@@ -39,37 +63,25 @@ async def test_simple_task_server():
                     }
                 }
             }
-            
-            await write.send(json.dumps(init_request))
-            response = await read.recv()
-            print(f"✅ Initialization response: {response}")
-            
-            # Test 1: List available tools
-            print("\n📋 Testing tool listing...")
+
+            await send(write, init_request)
+            init_response = await recv(read)
+            print(f"✅ Initialization response: {init_response}")
+
+            await send(write, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+            # Queue the remaining requests back to back, then match the
+            # responses to them by id
             tools_request = {
                 "jsonrpc": "2.0",
                 "id": 2,
                 "method": "tools/list"
             }
-            
-            await write.send(json.dumps(tools_request))
-            response = await read.recv()
-            print(f"Tools available: {response}")
-            
-            # Test 2: List available resources
-            print("\n📚 Testing resource listing...")
             resources_request = {
                 "jsonrpc": "2.0",
                 "id": 3,
                 "method": "resources/list"
             }
-            
-            await write.send(json.dumps(resources_request))
-            response = await read.recv()
-            print(f"Resources available: {response}")
-            
-            # Test 3: Call a tool (list tasks)
-            print("\n🔧 Testing tool call (list_tasks)...")
             call_request = {
                 "jsonrpc": "2.0",
                 "id": 4,
@@ -79,13 +91,6 @@ async def test_simple_task_server():
                     "arguments": {}
                 }
             }
-            
-            await write.send(json.dumps(call_request))
-            response = await read.recv()
-            print(f"List tasks result: {response}")
-            
-            # Test 4: Read a resource
-            print("\n📖 Testing resource reading...")
             read_request = {
                 "jsonrpc": "2.0",
                 "id": 5,
@@ -94,20 +99,63 @@ async def test_simple_task_server():
                     "uri": "tasks://summary"
                 }
             }
-            
-            await write.send(json.dumps(read_request))
-            response = await read.recv()
-            print(f"Resource read result: {response}")
-            
+            prompt_request = {
+                "jsonrpc": "2.0",
+                "id": 6,
+                "method": "prompts/get",
+                "params": {
+                    "name": "task_summary",
+                    "arguments": {
+                        "task_id": "1"
+                    }
+                }
+            }
+            requests = [tools_request, resources_request, call_request, read_request, prompt_request]
+
+            for request in requests:
+                await send(write, request)
+
+            responses = {init_response["id"]: init_response}
+            for _ in requests:
+                response = await recv(read)
+                responses[response["id"]] = response
+
+            # Test 1: List available tools
+            print("\n📋 Testing tool listing...")
+            print(f"Tools available: {responses[2]}")
+
+            # Test 2: List available resources
+            print("\n📚 Testing resource listing...")
+            print(f"Resources available: {responses[3]}")
+
+            # Test 3: Call a tool (list tasks)
+            print("\n🔧 Testing tool call (list_tasks)...")
+            print(f"List tasks result: {responses[4]}")
+
+            # Test 4: Read a resource
+            print("\n📖 Testing resource reading...")
+            print(f"Resource read result: {responses[5]}")
+
+            # Test 5: Get a prompt
+            print("\n💬 Testing prompt retrieval (task_summary)...")
+            print(f"Prompt result: {responses[6]}")
+
+            # Tool failures come back as a result flagged isError rather than a JSON-RPC error
+            failed = [
+                response["id"] for response in responses.values()
+                if "error" in response or response.get("result", {}).get("isError")
+            ]
+            if failed:
+                print(f"\n❌ Test failed: error responses for request ids {failed}")
+                return False
+
             print("\n✅ All tests completed successfully!")
-            
+            return True
+
     except Exception as e:
         print(f"❌ Test failed: {e}")
-    finally:
-        # Clean up
-        server_process.terminate()
-        server_process.wait()
+        return False
 
 if __name__ == "__main__":
-    asyncio.run(test_simple_task_server())
-
+    if not asyncio.run(test_simple_task_server()):
+        sys.exit(1)
@@ -5,18 +5,33 @@ Shows core architectural principles with working code.
 """
 
 import asyncio
+import bisect
+import copy
+import itertools
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _dumps(payload: Any) -> bytes:
+    """Encode a payload as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
 class TaskStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -29,7 +44,118 @@ class TaskPriority(Enum):
     HIGH = 3
     URGENT = 4
 
-@dataclass
+# Priority names in value order; TaskPriority values run 1..4
+_PRIORITY_NAMES = tuple(priority.name for priority in TaskPriority)
+
+# Methods offered under each capability
+_CAPABILITIES_MAP = {
+    "tasks": (
+        "create_task",
+        "update_task",
+        "assign_task",
+        "search_tasks"
+    ),
+    "resources": (
+        "get_all_tasks",
+        "get_active_tasks",
+        "get_overdue_tasks",
+        "get_user_workloads"
+    ),
+    "prompts": (
+        "task_analysis",
+        "workload_optimization",
+        "project_status_report"
+    ),
+    "notifications": (
+        "subscribe_events",
+        "unsubscribe_events"
+    )
+}
+
+# Icon shown for each status in the dependency graph
+_STATUS_ICONS = {
+    TaskStatus.COMPLETED: "✅",
+    TaskStatus.IN_PROGRESS: "🔄",
+    TaskStatus.PENDING: "⏳",
+    TaskStatus.BLOCKED: "🚫"
+}
+
+# Body of the task analysis prompt
+_TASK_PROMPT_TEMPLATE = """Analyze the following task and provide insights:
+
+Task Details:
+- ID: {id}
+- Title: {title}
+- Description: {description}
+- Status: {status}
+- Priority: {priority_name} ({priority_value}/4)
+- Assigned to: {assigned_to}
+- Created: {created}
+- Due date: {due_date}
+- Tags: {tags}
+
+Please provide:
+1. Current status assessment
+2. Risk factors and blockers
+3. Recommendations for next steps
+"""
+
+def _fmt_dt(dt: datetime) -> str:
+    """Format a datetime as YYYY-MM-DD HH:MM without going through strftime."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+# Events clients can subscribe to
+_EVENT_TYPES = ("task_created", "task_updated", "task_completed")
+
+# Statuses counted as active work
+_ACTIVE_STATUSES = frozenset({TaskStatus.PENDING, TaskStatus.IN_PROGRESS})
+
+# Sample users and tasks loaded into every demo server. Task specs are
+# (id, title, description, status, priority, created, updated, assigned_to,
+# due, tags, dependencies), with dates given as offsets from server start.
+_SAMPLE_USERS = {
+    "alice": {
+        "name": "Alice Johnson",
+        "role": "Senior Developer",
+        "skills": ["python", "javascript", "architecture"],
+        "max_concurrent_tasks": 3
+    },
+    "bob": {
+        "name": "Bob Smith",
+        "role": "UI/UX Designer",
+        "skills": ["design", "prototyping", "user-research"],
+        "max_concurrent_tasks": 2
+    },
+    "carol": {
+        "name": "Carol Davis",
+        "role": "Project Manager",
+        "skills": ["planning", "coordination", "stakeholder-management"],
+        "max_concurrent_tasks": 5
+    }
+}
+
+_SAMPLE_TASK_SPECS = (
+    ("task-001",
+     "Implement user authentication system",
+     "Design and implement a secure user authentication system with JWT tokens",
+     TaskStatus.IN_PROGRESS, TaskPriority.HIGH,
+     -timedelta(days=3), -timedelta(hours=2), "alice", timedelta(days=5),
+     ("backend", "security", "authentication"), ()),
+    ("task-002",
+     "Design user onboarding flow",
+     "Create wireframes and prototypes for new user onboarding experience",
+     TaskStatus.COMPLETED, TaskPriority.MEDIUM,
+     -timedelta(days=7), -timedelta(days=1), "bob", -timedelta(days=1),
+     ("frontend", "ux", "onboarding"), ()),
+    ("task-003",
+     "Set up CI/CD pipeline",
+     "Configure automated testing and deployment pipeline",
+     TaskStatus.PENDING, TaskPriority.HIGH,
+     -timedelta(days=2), -timedelta(days=2), None, timedelta(days=7),
+     ("devops", "automation", "infrastructure"), ("task-001",))
+)
+
+@dataclass(slots=True)
 class Task:
     id: str
     title: str
@@ -40,14 +166,8 @@ class Task:
     updated_at: datetime
     assigned_to: Optional[str] = None
     due_date: Optional[datetime] = None
-    tags: List[str] = None
-    dependencies: List[str] = None
-    
-    def __post_init__(self):
-        if self.tags is None:
-            self.tags = []
-        if self.dependencies is None:
-            self.dependencies = []
+    tags: List[str] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
 
 class MCPArchitectureDemo:
     """
@@ -63,106 +183,137 @@ class MCPArchitectureDemo:
         self.server_name = server_name
         self.capabilities = capabilities or {"tasks", "notifications", "analytics"}
         
+        # Capabilities are fixed for the server's lifetime, so the filtered table is built once
+        self._capabilities = {
+            capability: _CAPABILITIES_MAP[capability]
+            for capability in self.capabilities
+            if capability in _CAPABILITIES_MAP
+        }
+        self._allowed_capabilities = tuple(self.capabilities)
+        
         # Data storage
         self.tasks: Dict[str, Task] = {}
         self.users: Dict[str, Dict[str, Any]] = {}
-        self.event_subscribers: Dict[str, Set[str]] = {
-            "task_created": set(),
-            "task_updated": set(),
-            "task_completed": set()
-        }
+        
+        # Subscribers per event type, as interned client codes: an append-only
+        # list to notify in order (None marks an unsubscribed slot) and a set
+        # to skip duplicate subscriptions
+        self._client_code: Dict[str, int] = {}
+        self._client_ids: List[str] = []
+        self._sub_lists: Dict[str, List[Optional[int]]] = {event_type: [] for event_type in _EVENT_TYPES}
+        self._sub_sets: Dict[str, Set[int]] = {event_type: set() for event_type in _EVENT_TYPES}
+        
+        # Indexes over self.tasks, filled by _add_task. Tasks are only ever added,
+        # so nothing moves a task between indexes after it is stored.
+        # Active and completed ids are dicts used as insertion-ordered sets.
+        self._active_ids: Dict[str, None] = {}
+        self._completed_ids: Dict[str, None] = {}
+        self._by_assignee: Dict[str, Set[str]] = {}  # User id -> ids of tasks assigned to them
+        self._by_due_date: List[Tuple[float, str]] = []  # (due timestamp, task id), sorted
+        self._priority_counts: List[int] = [0] * len(_PRIORITY_NAMES)  # Indexed by priority value - 1
+        self._tag_bits: Dict[str, int] = {}  # Tag -> its bit in a tag mask
+        self._tag_masks: Dict[str, int] = {}  # Task id -> OR of its tags' bits
+        
+        # ISO forms of each task's timestamps, keyed by task id. An entry holds the
+        # datetimes it was built from and is reused only while the task still has them.
+        self._iso_cache: Dict[str, Tuple[datetime, datetime, Optional[datetime], str, str, Optional[str]]] = {}
         
         # Initialize sample data
         self._initialize_sample_data()
         
-        logger.info(f"Initialized {server_name} with capabilities: {', '.join(self.capabilities)}")
+        logger.info("Initialized %s with capabilities: %s", server_name, ", ".join(self.capabilities))
     
     def _initialize_sample_data(self):
         """Initialize with sample data for demonstration."""
         
         # Sample users
-        self.users = {
-            "alice": {
-                "name": "Alice Johnson",
-                "role": "Senior Developer",
-                "skills": ["python", "javascript", "architecture"],
-                "max_concurrent_tasks": 3
-            },
-            "bob": {
-                "name": "Bob Smith", 
-                "role": "UI/UX Designer",
-                "skills": ["design", "prototyping", "user-research"],
-                "max_concurrent_tasks": 2
-            },
-            "carol": {
-                "name": "Carol Davis",
-                "role": "Project Manager",
-                "skills": ["planning", "coordination", "stakeholder-management"],
-                "max_concurrent_tasks": 5
-            }
-        }
+        self.users = copy.deepcopy(_SAMPLE_USERS)
         
-        # Sample tasks
+        # Sample tasks, dated relative to a single reading of the clock
+        now = datetime.now()
         sample_tasks = [
             Task(
-                id="task-001",
-                title="Implement user authentication system",
-                description="Design and implement a secure user authentication system with JWT tokens",
-                status=TaskStatus.IN_PROGRESS,
-                priority=TaskPriority.HIGH,
-                created_at=datetime.now() - timedelta(days=3),
-                updated_at=datetime.now() - timedelta(hours=2),
-                assigned_to="alice",
-                due_date=datetime.now() + timedelta(days=5),
-                tags=["backend", "security", "authentication"],
-                dependencies=[]
-            ),
-            Task(
-                id="task-002",
-                title="Design user onboarding flow",
-                description="Create wireframes and prototypes for new user onboarding experience",
-                status=TaskStatus.COMPLETED,
-                priority=TaskPriority.MEDIUM,
-                created_at=datetime.now() - timedelta(days=7),
-                updated_at=datetime.now() - timedelta(days=1),
-                assigned_to="bob",
-                due_date=datetime.now() - timedelta(days=1),
-                tags=["frontend", "ux", "onboarding"],
-                dependencies=[]
-            ),
-            Task(
-                id="task-003",
-                title="Set up CI/CD pipeline",
-                description="Configure automated testing and deployment pipeline",
-                status=TaskStatus.PENDING,
-                priority=TaskPriority.HIGH,
-                created_at=datetime.now() - timedelta(days=2),
-                updated_at=datetime.now() - timedelta(days=2),
-                assigned_to=None,
-                due_date=datetime.now() + timedelta(days=7),
-                tags=["devops", "automation", "infrastructure"],
-                dependencies=["task-001"]
+                id=task_id,
+                title=title,
+                description=description,
+                status=status,
+                priority=priority,
+                created_at=now + created_offset,
+                updated_at=now + updated_offset,
+                assigned_to=assigned_to,
+                due_date=now + due_offset,
+                tags=list(tags),
+                dependencies=list(dependencies)
             )
+            for (task_id, title, description, status, priority, created_offset,
+                 updated_offset, assigned_to, due_offset, tags, dependencies) in _SAMPLE_TASK_SPECS
         ]
         
         for task in sample_tasks:
-            self.tasks[task.id] = task
+            self._add_task(task)
+    
+    def _add_task(self, task: Task):
+        """Store a task and add it to the indexes."""
+        self.tasks[task.id] = task
+        self._index_status(task)
+        self._priority_counts[task.priority.value - 1] += 1
+        if task.assigned_to is not None:
+            self._by_assignee.setdefault(task.assigned_to, set()).add(task.id)
+        if task.due_date is not None:
+            bisect.insort(self._by_due_date, (task.due_date.timestamp(), task.id))
+        
+        mask = 0
+        for tag in task.tags:
+            bit = self._tag_bits.get(tag)
+            if bit is None:
+                bit = self._tag_bits[tag] = 1 << len(self._tag_bits)
+            mask |= bit
+        self._tag_masks[task.id] = mask
+    
+    def _index_status(self, task: Task):
+        """Record a task under its current status."""
+        if task.status in _ACTIVE_STATUSES:
+            self._active_ids[task.id] = None
+        elif task.status == TaskStatus.COMPLETED:
+            self._completed_ids[task.id] = None
+    
+    def _overdue_ids(self):
+        """Yield ids of unfinished tasks whose due date has passed, earliest first."""
+        end = bisect.bisect_left(self._by_due_date, (time.time(),))
+        completed = self._completed_ids
+        for _, task_id in itertools.islice(self._by_due_date, end):
+            if task_id not in completed:
+                yield task_id
     
     # Principle 1: Separation of Concerns
     def get_task_data(self) -> Dict[str, Any]:
         """Resource provider - handles data access only."""
         return {
             "all_tasks": self._serialize_tasks(self.tasks.values()),
-            "active_tasks": self._serialize_tasks([
-                task for task in self.tasks.values()
-                if task.status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]
-            ]),
-            "overdue_tasks": self._serialize_tasks([
-                task for task in self.tasks.values()
-                if task.due_date and task.due_date < datetime.now() and task.status != TaskStatus.COMPLETED
-            ])
+            "active_tasks": self._serialize_tasks(self.tasks[task_id] for task_id in self._active_ids),
+            "overdue_tasks": self._serialize_tasks(self.tasks[task_id] for task_id in self._overdue_ids())
         }
     
+    def get_task_data_json(self) -> bytes:
+        """Resource provider - returns the task data encoded as JSON."""
+        # Each task is serialized once and shared by every list it appears in
+        serialized = {task_id: self._serialize_task(task) for task_id, task in self.tasks.items()}
+        return _dumps({
+            "all_tasks": list(serialized.values()),
+            "active_tasks": [serialized[task_id] for task_id in self._active_ids],
+            "overdue_tasks": [serialized[task_id] for task_id in self._overdue_ids()]
+        })
+    
+    def find_tasks_with_tags(self, tags: List[str]) -> List[str]:
+        """Return the ids of tasks that carry every one of the given tags."""
+        needed = 0
+        for tag in tags:
+            bit = self._tag_bits.get(tag)
+            if bit is None:
+                return []
+            needed |= bit
+        return [task_id for task_id, mask in self._tag_masks.items() if mask & needed == needed]
+    
     async def create_task(self, title: str, description: str, **kwargs) -> Dict[str, Any]:
         """Tool provider - handles actions only."""
         
@@ -178,14 +329,14 @@ class MCPArchitectureDemo:
             updated_at=datetime.now(),
             assigned_to=kwargs.get("assigned_to"),
             due_date=kwargs.get("due_date"),
-            tags=kwargs.get("tags", []),
-            dependencies=kwargs.get("dependencies", [])
+            tags=kwargs.get("tags") or [],
+            dependencies=kwargs.get("dependencies") or []
         )
         
-        self.tasks[task_id] = task
+        self._add_task(task)
         
         # Principle 3: Bidirectional Communication - send event
-        await self._send_event("task_created", {
+        self._send_event("task_created", {
             "task_id": task_id,
             "title": title,
             "assigned_to": task.assigned_to
@@ -200,72 +351,35 @@ class MCPArchitectureDemo:
     def generate_task_prompt(self, task_id: str) -> str:
         """Prompt provider - handles conversation templates only."""
         
-        if task_id not in self.tasks:
+        task = self.tasks.get(task_id)
+        if task is None:
             raise ValueError(f"Task {task_id} not found")
         
-        task = self.tasks[task_id]
-        
-        prompt = f"""Analyze the following task and provide insights:
-
-Task Details:
-- ID: {task.id}
-- Title: {task.title}
-- Description: {task.description}
-- Status: {task.status.value}
-- Priority: {task.priority.name} ({task.priority.value}/4)
-- Assigned to: {task.assigned_to or 'Unassigned'}
-- Created: {task.created_at.strftime('%Y-%m-%d %H:%M')}
-- Due date: {task.due_date.strftime('%Y-%m-%d %H:%M') if task.due_date else 'Not set'}
-- Tags: {', '.join(task.tags) if task.tags else 'None'}
-
-Please provide:
-1. Current status assessment
-2. Risk factors and blockers
-3. Recommendations for next steps
-"""
-        
-        return prompt
+        return _TASK_PROMPT_TEMPLATE.format_map({
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status.value,
+            "priority_name": task.priority.name,
+            "priority_value": task.priority.value,
+            "assigned_to": task.assigned_to or "Unassigned",
+            "created": _fmt_dt(task.created_at),
+            "due_date": _fmt_dt(task.due_date) if task.due_date else "Not set",
+            "tags": ", ".join(task.tags) if task.tags else "None"
+        })
     
     # Principle 2: Protocol-First Design
-    def get_capabilities(self) -> Dict[str, List[str]]:
+    def get_capabilities(self) -> Dict[str, Tuple[str, ...]]:
         """Return available capabilities in a standardized format."""
         
-        capabilities_map = {
-            "tasks": [
-                "create_task",
-                "update_task", 
-                "assign_task",
-                "search_tasks"
-            ],
-            "resources": [
-                "get_all_tasks",
-                "get_active_tasks",
-                "get_overdue_tasks",
-                "get_user_workloads"
-            ],
-            "prompts": [
-                "task_analysis",
-                "workload_optimization",
-                "project_status_report"
-            ],
-            "notifications": [
-                "subscribe_events",
-                "unsubscribe_events"
-            ]
-        }
-        
-        available_capabilities = {}
-        for capability in self.capabilities:
-            if capability in capabilities_map:
-                available_capabilities[capability] = capabilities_map[capability]
-        
-        return available_capabilities
+        return dict(self._capabilities)
     
     # Principle 3: Bidirectional Communication
-    async def _send_event(self, event_type: str, data: Dict[str, Any]):
+    def _send_event(self, event_type: str, data: Dict[str, Any]):
         """Send event notifications to subscribed clients."""
         
-        if event_type in self.event_subscribers:
+        subscribers = self._sub_lists.get(event_type)
+        if subscribers is not None:
             event_data = {
                 "event_type": event_type,
                 "timestamp": datetime.now().isoformat(),
@@ -273,19 +387,26 @@ Please provide:
                 "data": data
             }
             
-            logger.info(f"Event: {event_type} - {data}")
+            logger.info("Event: %s - %s", event_type, data)
             
             # In a real implementation, this would send to actual subscribers
-            for subscriber in self.event_subscribers[event_type]:
-                logger.info(f"  → Notifying subscriber: {subscriber}")
+            if logger.isEnabledFor(logging.INFO):
+                client_ids = self._client_ids
+                for code in subscribers:
+                    if code is not None:
+                        logger.info("  → Notifying subscriber: %s", client_ids[code])
     
     def subscribe_to_events(self, client_id: str, event_types: List[str]) -> Dict[str, Any]:
         """Allow clients to subscribe to events."""
         
+        code = self._intern_client(client_id)
         subscribed_events = []
         for event_type in event_types:
-            if event_type in self.event_subscribers:
-                self.event_subscribers[event_type].add(client_id)
+            members = self._sub_sets.get(event_type)
+            if members is not None:
+                if code not in members:
+                    members.add(code)
+                    self._sub_lists[event_type].append(code)
                 subscribed_events.append(event_type)
         
         return {
@@ -295,6 +416,38 @@ Please provide:
             "message": f"Subscribed to {len(subscribed_events)} event types"
         }
     
+    def unsubscribe_from_events(self, client_id: str, event_types: List[str]) -> Dict[str, Any]:
+        """Allow clients to unsubscribe from events."""
+        
+        code = self._client_code.get(client_id)
+        unsubscribed_events = []
+        for event_type in event_types:
+            members = self._sub_sets.get(event_type)
+            if members is not None and code in members:
+                members.remove(code)
+                subscribers = self._sub_lists[event_type]
+                subscribers[subscribers.index(code)] = None
+                # Compact once unsubscribed slots outnumber live ones
+                if len(members) * 2 < len(subscribers):
+                    subscribers[:] = [c for c in subscribers if c is not None]
+                unsubscribed_events.append(event_type)
+        
+        return {
+            "success": True,
+            "client_id": client_id,
+            "unsubscribed_events": unsubscribed_events,
+            "message": f"Unsubscribed from {len(unsubscribed_events)} event types"
+        }
+    
+    def _intern_client(self, client_id: str) -> int:
+        """Return the integer code for a client, assigning one on first use."""
+        code = self._client_code.get(client_id)
+        if code is None:
+            code = len(self._client_ids)
+            self._client_code[client_id] = code
+            self._client_ids.append(client_id)
+        return code
+    
     # Principle 4: Capability-Based Security
     def check_capability_access(self, client_id: str, capability: str) -> bool:
         """Check if a client has access to a specific capability."""
@@ -310,7 +463,7 @@ Please provide:
         # For demo, we'll return the server's capabilities
         return {
             "client_id": client_id,
-            "allowed_capabilities": list(self.capabilities),
+            "allowed_capabilities": self._allowed_capabilities,
             "permissions": {
                 "read_tasks": True,
                 "create_tasks": True,
@@ -324,19 +477,18 @@ Please provide:
     def compose_with_other_server(self, other_server: 'MCPArchitectureDemo') -> Dict[str, Any]:
         """Demonstrate how servers can be composed together."""
         
-        combined_capabilities = self.capabilities.union(other_server.capabilities)
+        combined_capabilities = list(self.capabilities | other_server.capabilities)
         
-        # Example: Combine task data from both servers
-        combined_tasks = {}
-        combined_tasks.update(self.tasks)
-        combined_tasks.update(other_server.tasks)
+        # Example: Count the tasks across both servers; ids present on both count once
+        tasks = self.tasks
+        total_tasks = len(tasks) + sum(1 for task_id in other_server.tasks if task_id not in tasks)
         
         return {
             "composition_result": True,
             "server1": self.server_name,
             "server2": other_server.server_name,
-            "combined_capabilities": list(combined_capabilities),
-            "total_tasks": len(combined_tasks),
+            "combined_capabilities": combined_capabilities,
+            "total_tasks": total_tasks,
             "message": f"Successfully composed {self.server_name} with {other_server.server_name}"
         }
     
@@ -348,23 +500,28 @@ Please provide:
         if total_tasks == 0:
             return {"total_tasks": 0, "message": "No tasks available"}
         
-        completed_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED])
-        overdue_tasks = len([
-            t for t in self.tasks.values()
-            if t.due_date and t.due_date < datetime.now() and t.status != TaskStatus.COMPLETED
-        ])
+        completed_tasks = len(self._completed_ids)
+        overdue_tasks = sum(1 for _ in self._overdue_ids())
         
-        # User workload analysis
+        # User workload analysis: one pass over each user's tasks
+        active_ids = self._active_ids
+        completed_ids = self._completed_ids
+        by_assignee = self._by_assignee
         user_workloads = {}
-        for user_id in self.users:
-            user_tasks = [task for task in self.tasks.values() if task.assigned_to == user_id]
-            active_tasks = [task for task in user_tasks if task.status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]]
+        for user_id, user in self.users.items():
+            user_task_ids = by_assignee.get(user_id, ())
+            active = completed = 0
+            for task_id in user_task_ids:
+                if task_id in active_ids:
+                    active += 1
+                elif task_id in completed_ids:
+                    completed += 1
             
             user_workloads[user_id] = {
-                "name": self.users[user_id]["name"],
-                "total_tasks": len(user_tasks),
-                "active_tasks": len(active_tasks),
-                "completed_tasks": len([t for t in user_tasks if t.status == TaskStatus.COMPLETED])
+                "name": user["name"],
+                "total_tasks": len(user_task_ids),
+                "active_tasks": active,
+                "completed_tasks": completed
             }
         
         return {
@@ -373,50 +530,61 @@ Please provide:
             "completion_rate": completed_tasks / total_tasks * 100,
             "overdue_tasks": overdue_tasks,
             "user_workloads": user_workloads,
-            "priority_distribution": {
-                priority.name: len([t for t in self.tasks.values() if t.priority == priority])
-                for priority in TaskPriority
-            }
+            "priority_distribution": dict(zip(_PRIORITY_NAMES, self._priority_counts))
         }
     
     def generate_dependency_graph(self) -> str:
         """Generate a simple dependency graph representation."""
         
+        tasks = self.tasks
         graph_lines = ["Task Dependency Graph:"]
+        append = graph_lines.append
         
-        for task in self.tasks.values():
-            status_icon = {
-                TaskStatus.COMPLETED: "✅",
-                TaskStatus.IN_PROGRESS: "🔄", 
-                TaskStatus.PENDING: "⏳",
-                TaskStatus.BLOCKED: "🚫"
-            }.get(task.status, "❓")
+        for task in tasks.values():
+            status_icon = _STATUS_ICONS.get(task.status, "❓")
             
-            graph_lines.append(f"  {status_icon} {task.title} ({task.id})")
+            append(f"  {status_icon} {task.title} ({task.id})")
             
-            if task.dependencies:
-                for dep_id in task.dependencies:
-                    if dep_id in self.tasks:
-                        dep_task = self.tasks[dep_id]
-                        dep_status = "✅" if dep_task.status == TaskStatus.COMPLETED else "⏳"
-                        graph_lines.append(f"    ↳ depends on: {dep_status} {dep_task.title}")
-                    else:
-                        graph_lines.append(f"    ↳ depends on: ❌ {dep_id} (not found)")
+            for dep_id in task.dependencies:
+                dep_task = tasks.get(dep_id)
+                if dep_task is None:
+                    append(f"    ↳ depends on: ❌ {dep_id} (not found)")
+                else:
+                    dep_status = "✅" if dep_task.status is TaskStatus.COMPLETED else "⏳"
+                    append(f"    ↳ depends on: {dep_status} {dep_task.title}")
         
         return "\n".join(graph_lines)
     
     # Utility methods
+    def _iso_timestamps(self, task: Task) -> Tuple[str, str, Optional[str]]:
+        """Return a task's created, updated and due times in ISO form."""
+        created, updated, due = task.created_at, task.updated_at, task.due_date
+        cached = self._iso_cache.get(task.id)
+        # datetimes are immutable, so the same objects always give the same strings
+        if cached is None or cached[0] is not created or cached[1] is not updated or cached[2] is not due:
+            cached = self._iso_cache[task.id] = (
+                created, updated, due,
+                created.isoformat(), updated.isoformat(), due.isoformat() if due else None
+            )
+        return cached[3:]
+    
     def _serialize_task(self, task: Task) -> Dict[str, Any]:
         """Serialize a task to a dictionary."""
-        task_dict = asdict(task)
-        task_dict["status"] = task.status.value
-        task_dict["priority"] = task.priority.value
-        task_dict["priority_name"] = task.priority.name
-        task_dict["created_at"] = task.created_at.isoformat()
-        task_dict["updated_at"] = task.updated_at.isoformat()
-        if task.due_date:
-            task_dict["due_date"] = task.due_date.isoformat()
-        return task_dict
+        created_iso, updated_iso, due_iso = self._iso_timestamps(task)
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status.value,
+            "priority": task.priority.value,
+            "created_at": created_iso,
+            "updated_at": updated_iso,
+            "assigned_to": task.assigned_to,
+            "due_date": due_iso,
+            "tags": list(task.tags),
+            "dependencies": list(task.dependencies),
+            "priority_name": task.priority.name
+        }
     
     def _serialize_tasks(self, tasks) -> List[Dict[str, Any]]:
         """Serialize a collection of tasks."""
@@ -427,6 +595,10 @@ async def demonstrate_mcp_architecture():
     Comprehensive demonstration of MCP architectural principles.
     """
     
+    # Run coroutines eagerly until their first real suspension
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     print("🏗️  MCP Architecture Principles Demonstration")
     print("=" * 60)
     